@@ -3,6 +3,7 @@ Django Admin configuration for Health Metrics models.
 """
 
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
 from .models import MetricType, HealthMetric, Goal, UserProfile
 
 
@@ -14,6 +15,15 @@ class MetricTypeAdmin(admin.ModelAdmin):
     ordering = ['name']
 
 
+class HealthMetricChangeList(ChangeList):
+    def get_queryset(self, request, *args, **kwargs):
+        # Only load the columns the change list renders
+        return super().get_queryset(request, *args, **kwargs).only(
+            'id', 'user__username', 'metric_type__name', 'metric_type__unit',
+            'value', 'recorded_date', 'created_at'
+        )
+
+
 @admin.register(HealthMetric)
 class HealthMetricAdmin(admin.ModelAdmin):
     list_display = ['user', 'metric_type', 'value', 'recorded_date', 'created_at']
@@ -22,6 +32,10 @@ class HealthMetricAdmin(admin.ModelAdmin):
     ordering = ['-recorded_date', '-created_at']
     date_hierarchy = 'recorded_date'
     raw_id_fields = ['user']
+    list_select_related = ('user', 'metric_type')
+
+    def get_changelist(self, request, **kwargs):
+        return HealthMetricChangeList
 
 
 @admin.register(Goal)
@@ -31,6 +45,7 @@ class GoalAdmin(admin.ModelAdmin):
     search_fields = ['user__username']
     ordering = ['-created_at']
     raw_id_fields = ['user']
+    list_select_related = ('user', 'metric_type')
 
 
 @admin.register(UserProfile)
@@ -39,3 +54,4 @@ class UserProfileAdmin(admin.ModelAdmin):
     list_filter = ['notifications_enabled', 'timezone']
     search_fields = ['user__username', 'user__email']
     raw_id_fields = ['user']
+    list_select_related = ('user',)
@@ -0,0 +1,28 @@
+"""
+Cache keys and helpers for per-user API responses.
+"""
+
+from django.core.cache import caches
+from django.db import transaction
+from django.utils import timezone
+from django.utils.connection import ConnectionProxy
+
+# Database-backed, so an invalidation in one worker is seen by all of them
+shared_cache = ConnectionProxy(caches, 'shared')
+
+DASHBOARD_CACHE_TIMEOUT = 300
+
+
+def dashboard_cache_key(user_id):
+    # Keyed by date so periods and expiry roll over at midnight
+    return f'dashboard:{user_id}:{timezone.localdate().isoformat()}'
+
+
+def invalidate_dashboard(user_id):
+    """
+    Drop the cached dashboard so the next request recomputes it.
+    Deferred until the current transaction commits, so a concurrent read
+    cannot re-cache pre-commit data.
+    """
+    key = dashboard_cache_key(user_id)
+    transaction.on_commit(lambda: shared_cache.delete(key))
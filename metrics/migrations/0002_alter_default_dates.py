@@ -0,0 +1,24 @@
+# Generated by Django 5.2.10 on 2026-10-15 04:04
+
+import datetime
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('metrics', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='goal',
+            name='start_date',
+            field=models.DateField(default=datetime.date.today),
+        ),
+        migrations.AlterField(
+            model_name='healthmetric',
+            name='recorded_date',
+            field=models.DateField(default=datetime.date.today),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.10 on 2026-10-15 04:08
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('metrics', '0002_alter_default_dates'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='healthmetric',
+            index=models.Index(fields=['user', '-recorded_date', '-created_at'], name='hm_user_recent_idx'),
+        ),
+        migrations.RemoveIndex(
+            model_name='healthmetric',
+            name='metrics_hea_user_id_9da3b6_idx',
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.10 on 2026-10-15 04:08
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('metrics', '0003_healthmetric_user_recent_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='goal',
+            name='target_value',
+            field=models.FloatField(validators=[django.core.validators.MinValueValidator(0)]),
+        ),
+        migrations.AlterField(
+            model_name='healthmetric',
+            name='value',
+            field=models.FloatField(validators=[django.core.validators.MinValueValidator(0)]),
+        ),
+    ]
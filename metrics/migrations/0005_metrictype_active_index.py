@@ -0,0 +1,17 @@
+# Generated by Django 5.2.10 on 2026-10-15 04:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('metrics', '0004_float_metric_values'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='metrictype',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['name'], name='active_metric_type_idx'),
+        ),
+    ]
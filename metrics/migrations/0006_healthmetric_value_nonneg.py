@@ -0,0 +1,19 @@
+# Generated by Django 5.2.10 on 2026-10-15 04:11
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('metrics', '0005_metrictype_active_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='healthmetric',
+            constraint=models.CheckConstraint(condition=models.Q(('value__gte', 0)), name='hm_value_nonneg'),
+        ),
+    ]
@@ -6,9 +6,12 @@ Demonstrates Django ORM patterns:
 - Field validation and constraints
 - Custom model methods
 - Meta options and ordering
+- Custom QuerySet methods for SQL annotations
 """
 
 from django.db import models
+from django.db.models import Case, Q, Value, When
+from django.db.models.functions import ExtractYear
 from django.contrib.auth.models import User
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
@@ -45,11 +48,30 @@ class MetricType(models.Model):
         ordering = ['name']
         verbose_name = 'Metric Type'
         verbose_name_plural = 'Metric Types'
+        indexes = [
+            # Most lookups only consider active metric types
+            models.Index(
+                fields=['name'],
+                condition=Q(is_active=True),
+                name='active_metric_type_idx'
+            ),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.unit})"
 
 
+class HealthMetricQuerySet(models.QuerySet):
+    """Custom queryset for HealthMetric."""
+
+    def with_metric_type(self):
+        """Join user and metric type, loading only the columns the API renders."""
+        return self.select_related('user', 'metric_type').only(
+            'id', 'value', 'recorded_date', 'notes', 'created_at', 'updated_at',
+            'user__username', 'metric_type__name', 'metric_type__unit'
+        )
+
+
 class HealthMetric(models.Model):
     """
     Individual health metric entries recorded by users.
@@ -64,16 +86,14 @@ class HealthMetric(models.Model):
         on_delete=models.PROTECT, 
         related_name='entries'
     )
-    value = models.DecimalField(
-        max_digits=10, 
-        decimal_places=2,
-        validators=[MinValueValidator(0)]
-    )
+    value = models.FloatField(validators=[MinValueValidator(0)])
     recorded_date = models.DateField(default=date.today)
     notes = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = HealthMetricQuerySet.as_manager()
+
     class Meta:
         ordering = ['-recorded_date', '-created_at']
         verbose_name = 'Health Metric'
@@ -83,10 +103,19 @@ class HealthMetric(models.Model):
             models.UniqueConstraint(
                 fields=['user', 'metric_type', 'recorded_date'],
                 name='unique_daily_metric'
-            )
+            ),
+            models.CheckConstraint(
+                condition=Q(value__gte=0),
+                name='hm_value_nonneg'
+            ),
         ]
         indexes = [
-            models.Index(fields=['user', 'recorded_date']),
+            # Matches the default ordering so per-user lists need no sort step;
+            # also serves (user, recorded_date) range filters.
+            models.Index(
+                fields=['user', '-recorded_date', '-created_at'],
+                name='hm_user_recent_idx'
+            ),
             models.Index(fields=['metric_type', 'recorded_date']),
         ]
 
@@ -107,6 +136,18 @@ class HealthMetric(models.Model):
                 )
 
 
+class GoalQuerySet(models.QuerySet):
+    """Custom queryset for Goal."""
+
+    def with_metric_type(self):
+        """Join the user and metric type rendered alongside each goal."""
+        return self.select_related('user', 'metric_type').defer('metric_type__description')
+
+    def active(self, today):
+        """Active goals that have not passed their end date."""
+        return self.filter(is_active=True).exclude(end_date__lt=today)
+
+
 class Goal(models.Model):
     """
     Health goals set by users for specific metric types.
@@ -131,11 +172,7 @@ class Goal(models.Model):
         on_delete=models.PROTECT, 
         related_name='goals'
     )
-    target_value = models.DecimalField(
-        max_digits=10, 
-        decimal_places=2,
-        validators=[MinValueValidator(0)]
-    )
+    target_value = models.FloatField(validators=[MinValueValidator(0)])
     goal_type = models.CharField(
         max_length=10, 
         choices=GoalType.choices, 
@@ -152,6 +189,8 @@ class Goal(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = GoalQuerySet.as_manager()
+
     class Meta:
         ordering = ['-created_at']
         verbose_name = 'Goal'
@@ -175,6 +214,24 @@ class Goal(models.Model):
         return False
 
 
+class UserProfileQuerySet(models.QuerySet):
+    """Custom queryset for UserProfile."""
+
+    def with_age(self):
+        """Annotate each profile with `age_years` computed in SQL."""
+        today = timezone.now().date()
+        birthday_pending = (
+            Q(date_of_birth__month__gt=today.month) |
+            Q(date_of_birth__month=today.month, date_of_birth__day__gt=today.day)
+        )
+        return self.annotate(
+            age_years=Value(today.year) - ExtractYear('date_of_birth') - Case(
+                When(birthday_pending, then=Value(1)),
+                default=Value(0)
+            )
+        )
+
+
 class UserProfile(models.Model):
     """
     Extended user profile for health-related settings.
@@ -195,6 +252,8 @@ class UserProfile(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = UserProfileQuerySet.as_manager()
+
     class Meta:
         verbose_name = 'User Profile'
         verbose_name_plural = 'User Profiles'
@@ -204,7 +263,12 @@ class UserProfile(models.Model):
 
     @property
     def age(self):
-        """Calculate user's age from date of birth."""
+        """
+        Calculate user's age from date of birth.
+        Uses the `age_years` annotation from with_age() when present.
+        """
+        if 'age_years' in self.__dict__:
+            return self.age_years
         if self.date_of_birth:
             today = timezone.now().date()
             return today.year - self.date_of_birth.year - (
@@ -0,0 +1,20 @@
+"""
+Pagination classes for the Health Metrics API.
+"""
+
+from rest_framework.pagination import CursorPagination
+
+
+class HealthMetricCursorPagination(CursorPagination):
+    """
+    Keyset pagination for health metric entries.
+
+    Seeks on recorded_date instead of using OFFSET, so deep pages cost the
+    same as the first one and no COUNT(*) is issued. created_at and id break
+    ties between same-day entries so no row is repeated or skipped across
+    pages; the order matches hm_user_recent_idx.
+    """
+    ordering = ('-recorded_date', '-created_at', '-id')
+    page_size = 100
+    page_size_query_param = 'page_size'
+    max_page_size = 500
@@ -12,13 +12,65 @@ Demonstrates DRF serializer patterns:
 from rest_framework import serializers
 from django.contrib.auth.models import User
 from django.contrib.auth.password_validation import validate_password
-from django.db.models import Avg, Sum, Count
+from django.db import IntegrityError, transaction
+from django.db.models import Avg, Sum, Count, Q
 from django.utils import timezone
-from datetime import timedelta
+from datetime import date, timedelta
+import math
+import time
 
 from .models import MetricType, HealthMetric, Goal, UserProfile
 
 
+ACTIVE_METRIC_TYPES_TTL = 60
+
+_active_metric_types = {'expires_at': 0.0, 'by_pk': {}}
+
+
+def get_active_metric_types():
+    """
+    Return active metric types keyed by primary key.
+
+    Cached in-process for ACTIVE_METRIC_TYPES_TTL seconds; cleared early by
+    the MetricType signal handlers.
+    """
+    if time.monotonic() >= _active_metric_types['expires_at']:
+        _active_metric_types['by_pk'] = {
+            metric_type.pk: metric_type
+            for metric_type in MetricType.objects.filter(is_active=True)
+        }
+        _active_metric_types['expires_at'] = time.monotonic() + ACTIVE_METRIC_TYPES_TTL
+    return _active_metric_types['by_pk']
+
+
+def clear_active_metric_types():
+    """Force the next get_active_metric_types() call to reload."""
+    _active_metric_types['expires_at'] = 0.0
+
+
+class CachedMetricTypeField(serializers.PrimaryKeyRelatedField):
+    """
+    Primary key field for active metric types.
+    Resolves ids from the in-process cache instead of querying per request.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault('queryset', MetricType.objects.filter(is_active=True))
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            pk = int(data)
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        metric_type = get_active_metric_types().get(pk)
+        if metric_type is None:
+            self.fail('does_not_exist', pk_value=data)
+        return metric_type
+
+
 class MetricTypeSerializer(serializers.ModelSerializer):
     """Serializer for MetricType model."""
     
@@ -46,8 +98,7 @@ class HealthMetricSerializer(serializers.ModelSerializer):
     Demonstrates nested serializers and custom validation.
     """
     metric_type = MetricTypeListSerializer(read_only=True)
-    metric_type_id = serializers.PrimaryKeyRelatedField(
-        queryset=MetricType.objects.filter(is_active=True),
+    metric_type_id = CachedMetricTypeField(
         source='metric_type',
         write_only=True
     )
@@ -63,7 +114,9 @@ class HealthMetricSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'username', 'created_at', 'updated_at']
 
     def validate_value(self, value):
-        """Ensure value is positive."""
+        """Ensure value is finite and positive."""
+        if not math.isfinite(value):
+            raise serializers.ValidationError("Value must be a finite number.")
         if value < 0:
             raise serializers.ValidationError("Value must be positive.")
         return value
@@ -93,20 +146,58 @@ class HealthMetricSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
+# Columns read by the list endpoint's values() fast path
+HEALTH_METRIC_LIST_VALUES = (
+    'id', 'user__username', 'metric_type_id', 'metric_type__name',
+    'metric_type__unit', 'value', 'recorded_date', 'notes',
+    'created_at', 'updated_at',
+)
+
+_date_field = serializers.DateField()
+_datetime_field = serializers.DateTimeField()
+
+
+def health_metric_row_representation(row):
+    """
+    Shape a HEALTH_METRIC_LIST_VALUES row like HealthMetricSerializer output,
+    without instantiating models or serializers.
+    """
+    return {
+        'id': row['id'],
+        'username': row['user__username'],
+        'metric_type': {
+            'id': row['metric_type_id'],
+            'name': row['metric_type__name'],
+            'unit': row['metric_type__unit'],
+        },
+        'value': row['value'],
+        'recorded_date': _date_field.to_representation(row['recorded_date']),
+        'notes': row['notes'],
+        'created_at': _datetime_field.to_representation(row['created_at']),
+        'updated_at': _datetime_field.to_representation(row['updated_at']),
+    }
+
+
 class HealthMetricCreateSerializer(serializers.ModelSerializer):
     """
     Simplified serializer for creating health metrics.
     """
+    metric_type = CachedMetricTypeField()
+
     class Meta:
         model = HealthMetric
         fields = ['metric_type', 'value', 'recorded_date', 'notes']
 
+    def validate_value(self, value):
+        """Reject NaN and infinity, which FloatField accepts."""
+        if not math.isfinite(value):
+            raise serializers.ValidationError("Value must be a finite number.")
+        return value
+
     def validate(self, attrs):
-        """Validate metric bounds and check for duplicates."""
+        """Validate metric bounds."""
         metric_type = attrs.get('metric_type')
         value = attrs.get('value')
-        recorded_date = attrs.get('recorded_date', timezone.now().date())
-        user = self.context['request'].user
 
         # Check bounds
         if metric_type and value is not None:
@@ -119,23 +210,117 @@ class HealthMetricCreateSerializer(serializers.ModelSerializer):
                     'value': f"Value must be at most {metric_type.max_value}"
                 })
 
-        # Check for existing entry (for create only)
-        if not self.instance:
-            existing = HealthMetric.objects.filter(
-                user=user,
-                metric_type=metric_type,
-                recorded_date=recorded_date
-            ).exists()
-            if existing:
-                raise serializers.ValidationError({
-                    'recorded_date': f"You already have a {metric_type.name} entry for this date."
-                })
-
         return attrs
 
     def create(self, validated_data):
+        """
+        Create the entry, relying on the unique_daily_metric constraint
+        to reject duplicates instead of checking beforehand.
+        """
         validated_data['user'] = self.context['request'].user
-        return super().create(validated_data)
+        try:
+            with transaction.atomic():
+                return super().create(validated_data)
+        except IntegrityError:
+            metric_type = validated_data['metric_type']
+            if not self._entry_exists(
+                validated_data['user'], metric_type,
+                validated_data.get('recorded_date', date.today())
+            ):
+                raise
+            raise self._duplicate_entry_error(metric_type)
+
+    def update(self, instance, validated_data):
+        """Translate unique_daily_metric violations when moving an entry."""
+        try:
+            with transaction.atomic():
+                return super().update(instance, validated_data)
+        except IntegrityError:
+            metric_type = validated_data.get('metric_type', instance.metric_type)
+            if not self._entry_exists(
+                instance.user_id, metric_type,
+                validated_data.get('recorded_date', instance.recorded_date),
+                exclude_pk=instance.pk
+            ):
+                raise
+            raise self._duplicate_entry_error(metric_type)
+
+    def _entry_exists(self, user, metric_type, recorded_date, exclude_pk=None):
+        """Whether an IntegrityError came from unique_daily_metric."""
+        return HealthMetric.objects.filter(
+            user=user, metric_type=metric_type, recorded_date=recorded_date
+        ).exclude(pk=exclude_pk).exists()
+
+    def _duplicate_entry_error(self, metric_type):
+        return serializers.ValidationError({
+            'recorded_date': f"You already have a {metric_type.name} entry for this date."
+        })
+
+
+def get_goal_windows(today):
+    """
+    Return the (start, end) date window for each goal type as of `today`.
+    """
+    return {
+        Goal.GoalType.DAILY: (today, today),
+        Goal.GoalType.WEEKLY: (today - timedelta(days=today.weekday()), today),
+        Goal.GoalType.MONTHLY: (today.replace(day=1), today),
+    }
+
+
+def progress_aggregates(windows):
+    """
+    Conditional aggregates for goal progress, for use in annotate() on
+    HealthMetric rows grouped by metric_type_id.
+    """
+    today = windows[Goal.GoalType.DAILY][0]
+    week_start = windows[Goal.GoalType.WEEKLY][0]
+    month_start = windows[Goal.GoalType.MONTHLY][0]
+    return {
+        'daily': Sum('value', filter=Q(recorded_date=today)),
+        'weekly': Avg('value', filter=Q(recorded_date__gte=week_start, recorded_date__lte=today)),
+        'monthly': Avg('value', filter=Q(recorded_date__gte=month_start, recorded_date__lte=today)),
+    }
+
+
+def progress_values_from_rows(rows):
+    """
+    Build the progress values dict from rows annotated with
+    progress_aggregates(): metric_type_id -> {goal type: current value}.
+    """
+    return {
+        row['metric_type_id']: {
+            Goal.GoalType.DAILY: row['daily'] or 0,
+            Goal.GoalType.WEEKLY: row['weekly'] or 0,
+            Goal.GoalType.MONTHLY: row['monthly'] or 0,
+        }
+        for row in rows
+    }
+
+
+def get_progress_values(user, windows, metric_type=None):
+    """
+    Compute current goal values for every metric type in one grouped query.
+
+    `windows` comes from get_goal_windows(). Returns a dict keyed by
+    metric_type_id, mapping each goal type to its current value (daily sum,
+    weekly/monthly average). Pass `metric_type` to restrict the scan to a
+    single metric type.
+    """
+    today = windows[Goal.GoalType.DAILY][0]
+    week_start = windows[Goal.GoalType.WEEKLY][0]
+    month_start = windows[Goal.GoalType.MONTHLY][0]
+
+    metrics = HealthMetric.objects.filter(
+        user=user,
+        recorded_date__gte=min(week_start, month_start),
+        recorded_date__lte=today
+    )
+    if metric_type is not None:
+        metrics = metrics.filter(metric_type=metric_type)
+
+    rows = metrics.values('metric_type_id').annotate(**progress_aggregates(windows))
+    return progress_values_from_rows(rows)
 
 
 class GoalSerializer(serializers.ModelSerializer):
@@ -144,8 +329,7 @@ class GoalSerializer(serializers.ModelSerializer):
     Demonstrates computed properties via SerializerMethodField.
     """
     metric_type = MetricTypeListSerializer(read_only=True)
-    metric_type_id = serializers.PrimaryKeyRelatedField(
-        queryset=MetricType.objects.filter(is_active=True),
+    metric_type_id = CachedMetricTypeField(
         source='metric_type',
         write_only=True
     )
@@ -168,47 +352,41 @@ class GoalSerializer(serializers.ModelSerializer):
         """
         Calculate current progress toward the goal.
         Returns percentage and current value.
+
+        Reads the per-request `windows` and `progress_values` context
+        entries (see get_goal_windows and get_progress_values), computing
+        them for this goal when the caller did not supply them.
         """
-        today = timezone.now().date()
-        
-        # Determine date range based on goal type
-        if obj.goal_type == Goal.GoalType.DAILY:
-            start = today
-            end = today
-        elif obj.goal_type == Goal.GoalType.WEEKLY:
-            start = today - timedelta(days=today.weekday())
-            end = today
-        else:  # MONTHLY
-            start = today.replace(day=1)
-            end = today
-
-        # Get metrics in range
-        metrics = HealthMetric.objects.filter(
-            user=obj.user,
-            metric_type=obj.metric_type,
-            recorded_date__gte=start,
-            recorded_date__lte=end
-        )
+        windows = self.context.get('windows')
+        if windows is None:
+            windows = get_goal_windows(timezone.now().date())
+        start, end = windows[obj.goal_type]
 
-        if obj.goal_type == Goal.GoalType.DAILY:
-            current_value = metrics.aggregate(Sum('value'))['value__sum'] or 0
-        else:
-            current_value = metrics.aggregate(Avg('value'))['value__avg'] or 0
+        progress_values = self.context.get('progress_values')
+        if progress_values is None:
+            progress_values = get_progress_values(obj.user_id, windows, obj.metric_type_id)
+        current_value = progress_values.get(obj.metric_type_id, {}).get(obj.goal_type, 0)
 
         # Calculate percentage
         if obj.target_value > 0:
-            percentage = min(100, (float(current_value) / float(obj.target_value)) * 100)
+            percentage = min(100, (current_value / obj.target_value) * 100)
         else:
             percentage = 0
 
         return {
             'current_value': float(current_value),
-            'target_value': float(obj.target_value),
+            'target_value': obj.target_value,
             'percentage': round(percentage, 1),
             'period_start': start.isoformat(),
             'period_end': end.isoformat()
         }
 
+    def validate_target_value(self, value):
+        """Reject NaN and infinity, which FloatField accepts."""
+        if not math.isfinite(value):
+            raise serializers.ValidationError("Target value must be a finite number.")
+        return value
+
     def validate(self, attrs):
         """Validate goal dates and uniqueness."""
         start_date = attrs.get('start_date', timezone.now().date())
@@ -241,6 +419,11 @@ class UserProfileSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'username', 'email', 'age', 'created_at', 'updated_at']
 
+    def update(self, instance, validated_data):
+        # An annotated age reflects the date of birth before this update
+        instance.__dict__.pop('age_years', None)
+        return super().update(instance, validated_data)
+
 
 class UserRegistrationSerializer(serializers.ModelSerializer):
     """
@@ -0,0 +1,27 @@
+"""
+Signal handlers for Health Metrics models.
+
+Keeps cached lookups and responses in sync with the database.
+"""
+
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .cache import invalidate_dashboard
+from .models import MetricType, HealthMetric, Goal
+from .serializers import clear_active_metric_types
+
+
+@receiver([post_save, post_delete], sender=MetricType)
+def clear_metric_type_caches(sender, **kwargs):
+    """Drop cached metric type lookups when a metric type changes."""
+    clear_active_metric_types()
+
+
+# post_save only: a post_delete receiver would disable fast deletes for
+# cascades (e.g. removing a user). API deletes invalidate in perform_destroy.
+@receiver(post_save, sender=HealthMetric)
+@receiver(post_save, sender=Goal)
+def clear_dashboard_cache(sender, instance, **kwargs):
+    """Drop the owner's cached dashboard when a metric or goal is saved."""
+    invalidate_dashboard(instance.user_id)
@@ -4,15 +4,19 @@ Tests for Health Metrics API.
 Basic test coverage for models, serializers, and API endpoints.
 """
 
-from django.test import TestCase
+from django.test import RequestFactory, TestCase, override_settings
 from django.contrib.auth.models import User
+from django.db import IntegrityError, connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
 from rest_framework.authtoken.models import Token
 from decimal import Decimal
-from datetime import date
+from datetime import date, timedelta
 
+from .cache import shared_cache
 from .models import MetricType, HealthMetric, Goal, UserProfile
+from .serializers import HealthMetricCreateSerializer
 
 
 class MetricTypeModelTest(TestCase):
@@ -49,6 +53,26 @@ class HealthMetricModelTest(TestCase):
         self.assertEqual(metric.user, self.user)
         self.assertEqual(metric.value, Decimal('5000'))
 
+    def test_negative_value_rejected_by_database(self):
+        """Test the hm_value_nonneg check constraint."""
+        with self.assertRaises(IntegrityError):
+            HealthMetric.objects.create(
+                user=self.user,
+                metric_type=self.metric_type,
+                value=-1,
+                recorded_date=date.today()
+            )
+
+    def test_str_uses_related_names(self):
+        """Test that __str__ shows the username and metric name (used by admin history)."""
+        metric = HealthMetric.objects.create(
+            user=self.user,
+            metric_type=self.metric_type,
+            value=5000,
+            recorded_date=date.today()
+        )
+        self.assertIn('testuser - steps', str(metric))
+
 
 class APIAuthenticationTest(APITestCase):
     """Tests for API authentication."""
@@ -64,6 +88,15 @@ class APIAuthenticationTest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertIn('token', response.data)
 
+    def test_logout_deletes_token(self):
+        """Test that logout removes the user's token."""
+        user = User.objects.create_user('testuser', 'test@test.com', 'testpass')
+        token = Token.objects.create(user=user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        response = self.client.post('/api/v1/auth/logout/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(Token.objects.filter(user=user).exists())
+
     def test_unauthenticated_access_denied(self):
         """Test that unauthenticated requests are denied."""
         response = self.client.get('/api/v1/metrics/')
@@ -113,6 +146,165 @@ class HealthMetricAPITest(APITestCase):
         })
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
 
+    def test_create_non_finite_value_rejected(self):
+        """Test that inf and nan values are rejected."""
+        for value in ['inf', 'nan']:
+            response = self.client.post('/api/v1/metrics/', {
+                'metric_type': self.metric_type.id,
+                'value': value,
+                'recorded_date': date.today().isoformat()
+            })
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn('value', response.data)
+        self.assertFalse(HealthMetric.objects.exists())
+
+    def test_create_duplicate_health_metric(self):
+        """Test that a second entry for the same day is rejected."""
+        payload = {
+            'metric_type': self.metric_type.id,
+            'value': '8000',
+            'recorded_date': date.today().isoformat()
+        }
+        self.client.post('/api/v1/metrics/', payload)
+        response = self.client.post('/api/v1/metrics/', payload)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('recorded_date', response.data)
+
+    def test_create_other_integrity_errors_not_reported_as_duplicates(self):
+        """Test that constraint violations other than unique_daily_metric propagate."""
+        request = RequestFactory().post('/api/v1/metrics/')
+        request.user = self.user
+        serializer = HealthMetricCreateSerializer(context={'request': request})
+        with self.assertRaises(IntegrityError):
+            serializer.create({
+                'metric_type': self.metric_type,
+                'value': -1,
+                'recorded_date': date.today()
+            })
+
+    def test_create_for_inactive_metric_type(self):
+        """Test that entries for deactivated metric types are rejected."""
+        self.metric_type.is_active = False
+        self.metric_type.save()
+        response = self.client.post('/api/v1/metrics/', {
+            'metric_type': self.metric_type.id,
+            'value': '8000',
+            'recorded_date': date.today().isoformat()
+        })
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('metric_type', response.data)
+
+    def test_update_to_duplicate_date(self):
+        """Test that moving an entry onto an existing date is rejected."""
+        HealthMetric.objects.create(
+            user=self.user, metric_type=self.metric_type,
+            value=5000, recorded_date=date.today()
+        )
+        metric = HealthMetric.objects.create(
+            user=self.user, metric_type=self.metric_type,
+            value=6000, recorded_date=date.today() - timedelta(days=1)
+        )
+        response = self.client.patch(f'/api/v1/metrics/{metric.id}/', {
+            'recorded_date': date.today().isoformat()
+        })
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('recorded_date', response.data)
+
+    def test_update_other_integrity_errors_not_reported_as_duplicates(self):
+        """Test that update re-raises constraint violations other than duplicates."""
+        metric = HealthMetric.objects.create(
+            user=self.user, metric_type=self.metric_type,
+            value=5000, recorded_date=date.today()
+        )
+        serializer = HealthMetricCreateSerializer(metric)
+        with self.assertRaises(IntegrityError):
+            serializer.update(metric, {'value': -1})
+
+    def test_create_uses_updated_bounds(self):
+        """Test that bounds changes are picked up by validation."""
+        self.client.post('/api/v1/metrics/', {
+            'metric_type': self.metric_type.id,
+            'value': '8000',
+            'recorded_date': (date.today() - timedelta(days=1)).isoformat()
+        })
+        self.metric_type.max_value = 5000
+        self.metric_type.save()
+        response = self.client.post('/api/v1/metrics/', {
+            'metric_type': self.metric_type.id,
+            'value': '8000',
+            'recorded_date': date.today().isoformat()
+        })
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('value', response.data)
+
+    def test_bulk_create_health_metrics(self):
+        """Test bulk upload skips entries that already exist."""
+        HealthMetric.objects.create(
+            user=self.user, metric_type=self.metric_type,
+            value=5000, recorded_date=date.today()
+        )
+        payload = [
+            {
+                'metric_type': self.metric_type.id,
+                'value': '7000',
+                'recorded_date': (date.today() - timedelta(days=day)).isoformat()
+            }
+            for day in range(3)
+        ]
+        response = self.client.post('/api/v1/metrics/bulk/', payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(HealthMetric.objects.filter(user=self.user).count(), 3)
+        self.assertEqual(
+            HealthMetric.objects.get(user=self.user, recorded_date=date.today()).value,
+            5000.0
+        )
+
+    def test_trends(self):
+        """Test trends returns data points in date order."""
+        for day in (2, 0, 1):
+            HealthMetric.objects.create(
+                user=self.user, metric_type=self.metric_type,
+                value=1000 * (day + 1), recorded_date=date.today() - timedelta(days=day)
+            )
+        response = self.client.get('/api/v1/metrics/trends/', {'metric_type': self.metric_type.id})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [point['value'] for point in response.json()['data_points']],
+            [3000.0, 2000.0, 1000.0]
+        )
+
+    def test_summary_clamps_days(self):
+        """Test that out-of-range or invalid days are clamped."""
+        response = self.client.get('/api/v1/metrics/summary/', {'days': 1000000})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data['period_start'],
+            (date.today() - timedelta(days=365)).isoformat()
+        )
+        response = self.client.get('/api/v1/metrics/summary/', {'days': 'abc'})
+        self.assertEqual(
+            response.data['period_start'],
+            (date.today() - timedelta(days=7)).isoformat()
+        )
+
+    def test_summary_metric_type_zero_is_filtered(self):
+        """Test that metric_type=0 filters to no metrics rather than all of them."""
+        HealthMetric.objects.create(
+            user=self.user, metric_type=self.metric_type,
+            value=5000, recorded_date=date.today()
+        )
+        response = self.client.get('/api/v1/metrics/summary/', {'metric_type': '0'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['metrics'], [])
+
+    def test_trends_invalid_metric_type(self):
+        """Test that a non-numeric metric_type returns 400."""
+        for metric_type in ['abc', '\u00b2']:
+            response = self.client.get('/api/v1/metrics/trends/', {'metric_type': metric_type})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            response = self.client.get('/api/v1/metrics/summary/', {'metric_type': metric_type})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
     def test_list_own_metrics_only(self):
         """Test that users can only see their own metrics."""
         # Create metric for this user
@@ -133,7 +325,70 @@ class HealthMetricAPITest(APITestCase):
         
         response = self.client.get('/api/v1/metrics/')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(len(response.data['results']), 1)
+
+    def test_list_matches_serializer_output(self):
+        """Test that list rows have the same shape as the detail endpoint."""
+        metric = HealthMetric.objects.create(
+            user=self.user, metric_type=self.metric_type,
+            value=5000, recorded_date=date.today(), notes='walk'
+        )
+        list_response = self.client.get('/api/v1/metrics/')
+        detail_response = self.client.get(f'/api/v1/metrics/{metric.id}/')
+        self.assertEqual(list_response.json()['results'][0], detail_response.json())
+
+    def test_list_query_count_is_constant(self):
+        """Test that listing metrics does not issue a query per row."""
+        for day in range(1, 6):
+            HealthMetric.objects.create(
+                user=self.user,
+                metric_type=self.metric_type,
+                value=1000 * day,
+                recorded_date=date.today() - timedelta(days=day)
+            )
+        # Token lookup, page
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/v1/metrics/')
+        self.assertEqual(len(response.data['results']), 5)
+
+    def test_list_cursor_pagination(self):
+        """Test that metrics are paginated with a cursor."""
+        for day in range(3):
+            HealthMetric.objects.create(
+                user=self.user,
+                metric_type=self.metric_type,
+                value=1000,
+                recorded_date=date.today() - timedelta(days=day)
+            )
+        response = self.client.get('/api/v1/metrics/', {'page_size': 2})
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertIsNotNone(response.data['next'])
+        response = self.client.get(response.data['next'])
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(
+            response.data['results'][0]['recorded_date'],
+            (date.today() - timedelta(days=2)).isoformat()
+        )
+
+    def test_list_cursor_pagination_same_day_entries(self):
+        """Test that same-day entries are neither repeated nor skipped across pages."""
+        created_ids = []
+        for index in range(5):
+            metric_type = MetricType.objects.create(name=f'type_{index}', unit='units')
+            created_ids.append(HealthMetric.objects.create(
+                user=self.user,
+                metric_type=metric_type,
+                value=index,
+                recorded_date=date.today()
+            ).id)
+        seen_ids = []
+        response = self.client.get('/api/v1/metrics/', {'page_size': 2})
+        while True:
+            seen_ids.extend(row['id'] for row in response.data['results'])
+            if not response.data['next']:
+                break
+            response = self.client.get(response.data['next'])
+        self.assertEqual(seen_ids, sorted(created_ids, reverse=True))
 
 
 class GoalAPITest(APITestCase):
@@ -155,6 +410,18 @@ class GoalAPITest(APITestCase):
         })
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
 
+    def test_create_goal_non_finite_target_rejected(self):
+        """Test that inf and nan target values are rejected."""
+        for target_value in ['inf', 'nan']:
+            response = self.client.post('/api/v1/goals/', {
+                'metric_type_id': self.metric_type.id,
+                'target_value': target_value,
+                'goal_type': 'DAILY',
+                'direction': 'INCREASE'
+            })
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn('target_value', response.data)
+
     def test_deactivate_goal(self):
         """Test deactivating a goal."""
         goal = Goal.objects.create(
@@ -168,11 +435,63 @@ class GoalAPITest(APITestCase):
         goal.refresh_from_db()
         self.assertFalse(goal.is_active)
 
+    def test_list_goal_progress(self):
+        """Test goal progress is computed from batched values."""
+        other_type = MetricType.objects.create(name='sleep', unit='hours')
+        Goal.objects.create(
+            user=self.user, metric_type=self.metric_type,
+            target_value=10000, goal_type='DAILY'
+        )
+        Goal.objects.create(
+            user=self.user, metric_type=other_type,
+            target_value=8, goal_type='WEEKLY'
+        )
+        HealthMetric.objects.create(
+            user=self.user, metric_type=self.metric_type,
+            value=5000, recorded_date=date.today()
+        )
+        response = self.client.get('/api/v1/goals/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        progress = {
+            g['metric_type']['name']: g['progress'] for g in response.data['results']
+        }
+        self.assertEqual(progress['steps']['current_value'], 5000.0)
+        self.assertEqual(progress['steps']['percentage'], 50.0)
+        self.assertEqual(progress['sleep']['current_value'], 0.0)
+
+
+class UserProfileAPITest(APITestCase):
+    """Tests for UserProfile API endpoints."""
+
+    def setUp(self):
+        self.user = User.objects.create_user('testuser', 'test@test.com', 'testpass')
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def test_profile_age(self):
+        """Test that age is computed and refreshed after an update."""
+        today = date.today()
+        profile = UserProfile.objects.create(
+            user=self.user, date_of_birth=date(today.year - 30, 1, 1)
+        )
+        # Token lookup, profile joined with user
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/v1/profile/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['age'], profile.age)
+        self.assertEqual(response.data['age'], 30)
+
+        response = self.client.patch(f'/api/v1/profile/{profile.id}/', {
+            'date_of_birth': date(today.year - 40, 1, 1).isoformat()
+        })
+        self.assertEqual(response.data['age'], 40)
+
 
 class DashboardAPITest(APITestCase):
     """Tests for Dashboard API endpoint."""
 
     def setUp(self):
+        shared_cache.clear()
         self.user = User.objects.create_user('testuser', 'test@test.com', 'testpass')
         self.token = Token.objects.create(user=self.user)
         self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
@@ -184,3 +503,72 @@ class DashboardAPITest(APITestCase):
         self.assertIn('total_metrics_logged', response.data)
         self.assertIn('active_goals', response.data)
         self.assertIn('metrics_this_week', response.data)
+
+    def test_dashboard_cache_invalidated_on_new_metric(self):
+        """Test that a new metric is reflected in a cached dashboard."""
+        metric_type = MetricType.objects.create(name='steps', unit='steps')
+        response = self.client.get('/api/v1/dashboard/')
+        self.assertEqual(response.data['total_metrics_logged'], 0)
+
+        # Token lookup and one cache read; the aggregates come from the cache
+        with self.assertNumQueries(2):
+            self.client.get('/api/v1/dashboard/')
+
+        # Invalidation runs once the write commits
+        with self.captureOnCommitCallbacks(execute=True):
+            metric = HealthMetric.objects.create(
+                user=self.user, metric_type=metric_type,
+                value=5000, recorded_date=date.today()
+            )
+        response = self.client.get('/api/v1/dashboard/')
+        self.assertEqual(response.data['total_metrics_logged'], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(f'/api/v1/metrics/{metric.id}/')
+        response = self.client.get('/api/v1/dashboard/')
+        self.assertEqual(response.data['total_metrics_logged'], 0)
+
+    def test_user_delete_cascades_without_loading_metrics(self):
+        """Test that deleting a user keeps the fast cascade delete for metrics."""
+        metric_type = MetricType.objects.create(name='steps', unit='steps')
+        for day in range(10):
+            HealthMetric.objects.create(
+                user=self.user, metric_type=metric_type,
+                value=5000, recorded_date=date.today() - timedelta(days=day)
+            )
+        with CaptureQueriesContext(connection) as queries:
+            self.user.delete()
+        self.assertFalse(HealthMetric.objects.exists())
+        self.assertFalse(any(
+            query['sql'].startswith('SELECT') and 'metrics_healthmetric' in query['sql']
+            for query in queries.captured_queries
+        ))
+
+    @override_settings(CACHES={
+        'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+        'shared': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+    })
+    def test_dashboard_query_count(self):
+        """Test that dashboard counts run in SQL, independent of row counts."""
+        metric_type = MetricType.objects.create(name='steps', unit='steps')
+        for day in range(10):
+            HealthMetric.objects.create(
+                user=self.user, metric_type=metric_type,
+                value=5000, recorded_date=date.today() - timedelta(days=day)
+            )
+        Goal.objects.create(
+            user=self.user, metric_type=metric_type,
+            target_value=10000, goal_type='DAILY'
+        )
+        # In-memory cache so only the dashboard's own queries are counted
+        shared_cache.clear()
+        # Token, grouped metric counts and progress, goals, recent metrics
+        with self.assertNumQueries(4):
+            response = self.client.get('/api/v1/dashboard/')
+        self.assertEqual(response.data['total_metrics_logged'], 10)
+        self.assertEqual(response.data['metrics_this_week'], 8)
+        self.assertEqual(response.data['active_goals'], 1)
+        self.assertEqual(response.data['goals_on_track'], 1)
+        self.assertEqual(
+            response.data['goal_progress'][0]['progress']['current_value'], 5000.0
+        )
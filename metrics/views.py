@@ -13,14 +13,21 @@ from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.renderers import BrowsableAPIRenderer
 from rest_framework.authtoken.models import Token
 from django_filters.rest_framework import DjangoFilterBackend
 from django.contrib.auth.models import User
-from django.db.models import Avg, Sum, Count, Min, Max
+from django.db import transaction
+from django.db.models import Avg, Sum, Count, Min, Max, Q
 from django.utils import timezone
 from datetime import timedelta
 
+from .cache import (
+    DASHBOARD_CACHE_TIMEOUT, dashboard_cache_key, invalidate_dashboard, shared_cache
+)
 from .models import MetricType, HealthMetric, Goal, UserProfile
+from .pagination import HealthMetricCursorPagination
+from .renderers import ORJSONRenderer
 from .serializers import (
     MetricTypeSerializer,
     HealthMetricSerializer,
@@ -29,9 +36,34 @@ from .serializers import (
     UserProfileSerializer,
     UserRegistrationSerializer,
     UserSerializer,
+    HEALTH_METRIC_LIST_VALUES,
+    get_goal_windows,
+    health_metric_row_representation,
+    get_progress_values,
+    progress_aggregates,
+    progress_values_from_rows,
 )
 
 
+MAX_DAYS = 365
+
+
+def _clamp_days(raw, default, cap=MAX_DAYS):
+    """Parse a `days` query param, clamped to 1..cap; default if invalid."""
+    try:
+        days = int(raw or default)
+    except (TypeError, ValueError):
+        return default
+    return max(1, min(days, cap))
+
+
+def _invalid_metric_type_response():
+    return Response(
+        {'error': 'metric_type must be an integer ID'},
+        status=status.HTTP_400_BAD_REQUEST
+    )
+
+
 class MetricTypeViewSet(viewsets.ModelViewSet):
     """
     ViewSet for MetricType CRUD operations.
@@ -52,41 +84,98 @@ class HealthMetricViewSet(viewsets.ModelViewSet):
     """
     serializer_class = HealthMetricSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = HealthMetricCursorPagination
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['metric_type', 'recorded_date']
     search_fields = ['notes']
     ordering_fields = ['recorded_date', 'value', 'created_at']
-    ordering = ['-recorded_date']
+    ordering = ['-recorded_date', '-created_at', '-id']
+    bulk_max_entries = 1000
 
     def get_queryset(self):
         """Return only the current user's metrics."""
-        return HealthMetric.objects.filter(user=self.request.user)
+        return HealthMetric.objects.filter(user=self.request.user).with_metric_type()
 
     def get_serializer_class(self):
         """Use different serializers for create/update vs read."""
-        if self.action in ['create', 'update', 'partial_update']:
+        if self.action in ['create', 'update', 'partial_update', 'bulk']:
             return HealthMetricCreateSerializer
         return HealthMetricSerializer
 
-    @action(detail=False, methods=['get'])
+    def perform_destroy(self, instance):
+        instance.delete()
+        invalidate_dashboard(instance.user_id)
+
+    def get_renderers(self):
+        """Render the list fast path with orjson."""
+        if self.action == 'list':
+            return [ORJSONRenderer(), BrowsableAPIRenderer()]
+        return super().get_renderers()
+
+    def list(self, request, *args, **kwargs):
+        """
+        List the user's metrics.
+        Reads plain rows with values() instead of running HealthMetricSerializer
+        per entry; the output shape is the same.
+        """
+        rows = self.filter_queryset(self.get_queryset()).values(*HEALTH_METRIC_LIST_VALUES)
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(
+                [health_metric_row_representation(row) for row in page]
+            )
+        return Response([health_metric_row_representation(row) for row in rows])
+
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """
+        Create many metric entries in one request (e.g. an app sync).
+
+        Expects a list of entries. Entries that already exist for the same
+        metric type and date are skipped.
+        """
+        serializer = self.get_serializer(
+            data=request.data, many=True, max_length=self.bulk_max_entries
+        )
+        serializer.is_valid(raise_exception=True)
+
+        metrics = [
+            HealthMetric(user=request.user, **entry)
+            for entry in serializer.validated_data
+        ]
+        HealthMetric.objects.bulk_create(metrics, batch_size=500, ignore_conflicts=True)
+        # bulk_create does not send post_save
+        invalidate_dashboard(request.user.id)
+
+        return Response({'submitted': len(metrics)}, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=['get'], renderer_classes=[ORJSONRenderer, BrowsableAPIRenderer])
     def summary(self, request):
         """
         Get summary statistics for the user's metrics.
         
         Query params:
-        - days: Number of days to include (default: 7)
+        - days: Number of days to include (default: 7, max: 365)
         - metric_type: Filter by specific metric type ID
         """
-        days = int(request.query_params.get('days', 7))
+        days = _clamp_days(request.query_params.get('days'), 7)
         metric_type_id = request.query_params.get('metric_type')
+        if metric_type_id is not None:
+            try:
+                metric_type_id = int(metric_type_id)
+            except ValueError:
+                return _invalid_metric_type_response()
         
-        start_date = timezone.now().date() - timedelta(days=days)
+        today = timezone.localdate()
+        start_date = today - timedelta(days=days)
         queryset = self.get_queryset().filter(recorded_date__gte=start_date)
         
-        if metric_type_id:
+        if metric_type_id is not None:
             queryset = queryset.filter(metric_type_id=metric_type_id)
 
-        summary = queryset.values('metric_type__name', 'metric_type__unit').annotate(
+        summary = queryset.values(
+            'metric_type_id', 'metric_type__name', 'metric_type__unit'
+        ).annotate(
             count=Count('id'),
             average=Avg('value'),
             total=Sum('value'),
@@ -96,18 +185,18 @@ class HealthMetricViewSet(viewsets.ModelViewSet):
 
         return Response({
             'period_start': start_date.isoformat(),
-            'period_end': timezone.now().date().isoformat(),
+            'period_end': today.isoformat(),
             'metrics': list(summary)
         })
 
-    @action(detail=False, methods=['get'])
+    @action(detail=False, methods=['get'], renderer_classes=[ORJSONRenderer, BrowsableAPIRenderer])
     def trends(self, request):
         """
         Get daily trends for a specific metric type.
         
         Query params:
         - metric_type: Metric type ID (required)
-        - days: Number of days (default: 30)
+        - days: Number of days (default: 30, max: 365)
         """
         metric_type_id = request.query_params.get('metric_type')
         if not metric_type_id:
@@ -115,24 +204,30 @@ class HealthMetricViewSet(viewsets.ModelViewSet):
                 {'error': 'metric_type parameter is required'},
                 status=status.HTTP_400_BAD_REQUEST
             )
+        try:
+            metric_type_pk = int(metric_type_id)
+        except ValueError:
+            return _invalid_metric_type_response()
 
-        days = int(request.query_params.get('days', 30))
-        start_date = timezone.now().date() - timedelta(days=days)
+        days = _clamp_days(request.query_params.get('days'), 30)
+        today = timezone.localdate()
+        start_date = today - timedelta(days=days)
 
-        metrics = self.get_queryset().filter(
-            metric_type_id=metric_type_id,
+        rows = HealthMetric.objects.filter(
+            user=request.user,
+            metric_type_id=metric_type_pk,
             recorded_date__gte=start_date
-        ).order_by('recorded_date')
+        ).order_by('recorded_date').values_list('recorded_date', 'value')
 
         data = [
-            {'date': m.recorded_date.isoformat(), 'value': float(m.value)}
-            for m in metrics
+            {'date': recorded_date.isoformat(), 'value': value}
+            for recorded_date, value in rows
         ]
 
         return Response({
             'metric_type_id': metric_type_id,
             'period_start': start_date.isoformat(),
-            'period_end': timezone.now().date().isoformat(),
+            'period_end': today.isoformat(),
             'data_points': data
         })
 
@@ -151,7 +246,24 @@ class GoalViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         """Return only the current user's goals."""
-        return Goal.objects.filter(user=self.request.user)
+        return Goal.objects.filter(user=self.request.user).with_metric_type()
+
+    def get_serializer_context(self):
+        """
+        Compute goal windows once per request, and progress values for
+        list actions in one query.
+        """
+        context = super().get_serializer_context()
+        context['windows'] = get_goal_windows(timezone.localdate())
+        if self.action in ['list', 'active']:
+            context['progress_values'] = get_progress_values(
+                self.request.user, context['windows']
+            )
+        return context
+
+    def perform_destroy(self, instance):
+        instance.delete()
+        invalidate_dashboard(instance.user_id)
 
     @action(detail=True, methods=['post'])
     def deactivate(self, request, pk=None):
@@ -164,8 +276,8 @@ class GoalViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def active(self, request):
         """Get only active, non-expired goals."""
-        today = timezone.now().date()
-        active_goals = self.get_queryset().filter(is_active=True).exclude(end_date__lt=today)
+        today = timezone.localdate()
+        active_goals = self.get_queryset().active(today)
         serializer = self.get_serializer(active_goals, many=True)
         return Response(serializer.data)
 
@@ -179,13 +291,19 @@ class UserProfileViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        """Return only the current user's profile."""
-        return UserProfile.objects.filter(user=self.request.user)
+        """Return only the current user's profile, with age computed in SQL."""
+        return UserProfile.objects.filter(
+            user=self.request.user
+        ).select_related('user').with_age()
 
     def get_object(self):
-        """Get or create the user's profile."""
-        profile, _ = UserProfile.objects.get_or_create(user=self.request.user)
-        return profile
+        """Get or create the user's profile, once per request."""
+        if not hasattr(self, '_profile'):
+            try:
+                self._profile = self.get_queryset().get()
+            except UserProfile.DoesNotExist:
+                self._profile, _ = UserProfile.objects.get_or_create(user=self.request.user)
+        return self._profile
 
     def list(self, request):
         """Return the current user's profile."""
@@ -205,8 +323,10 @@ class AuthViewSet(viewsets.ViewSet):
         """Register a new user account."""
         serializer = UserRegistrationSerializer(data=request.data)
         if serializer.is_valid():
-            user = serializer.save()
-            token, _ = Token.objects.get_or_create(user=user)
+            # User, profile and token are created together or not at all
+            with transaction.atomic():
+                user = serializer.save()
+                token = Token.objects.create(user=user)
             return Response({
                 'user': UserSerializer(user).data,
                 'token': token.key,
@@ -217,10 +337,7 @@ class AuthViewSet(viewsets.ViewSet):
     @action(detail=False, methods=['post'], permission_classes=[IsAuthenticated])
     def logout(self, request):
         """Logout and invalidate the token."""
-        try:
-            request.user.auth_token.delete()
-        except Exception:
-            pass
+        Token.objects.filter(user=request.user).delete()
         return Response({'message': 'Logged out successfully'})
 
     @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
@@ -237,40 +354,64 @@ class DashboardViewSet(viewsets.ViewSet):
     permission_classes = [IsAuthenticated]
 
     def list(self, request):
-        """Get dashboard summary data for the current user."""
+        """
+        Get dashboard summary data for the current user.
+        Cached per user; metric and goal changes invalidate the entry.
+        """
+        data = shared_cache.get_or_set(
+            dashboard_cache_key(request.user.id),
+            lambda: self._build_dashboard(request),
+            DASHBOARD_CACHE_TIMEOUT
+        )
+        return Response(data)
+
+    def _build_dashboard(self, request):
+        """
+        Assemble the dashboard payload in three queries: one grouped pass
+        over the user's metrics for counts and goal progress, the active
+        goals, and the most recent entries.
+        """
         user = request.user
-        today = timezone.now().date()
+        today = timezone.localdate()
         week_ago = today - timedelta(days=7)
+        windows = get_goal_windows(today)
 
-        total_metrics = HealthMetric.objects.filter(user=user).count()
-        metrics_this_week = HealthMetric.objects.filter(
-            user=user, recorded_date__gte=week_ago
-        ).count()
-        
-        active_goals = Goal.objects.filter(
-            user=user, is_active=True
-        ).exclude(end_date__lt=today)
+        metric_rows = list(
+            HealthMetric.objects.filter(user=user).values('metric_type_id').annotate(
+                total=Count('id'),
+                this_week=Count('id', filter=Q(recorded_date__gte=week_ago)),
+                **progress_aggregates(windows)
+            )
+        )
+
+        active_goals = list(
+            Goal.objects.filter(user=user).active(today).with_metric_type()
+        )
         
         recent_metrics = HealthMetric.objects.filter(
             user=user
-        ).order_by('-recorded_date', '-created_at')[:5]
+        ).with_metric_type().order_by('-recorded_date', '-created_at')[:5]
 
         # Calculate goals on track (>= 50% progress)
         goals_on_track = 0
         goal_serializer = GoalSerializer(
-            active_goals, many=True, context={'request': request}
+            active_goals, many=True, context={
+                'request': request,
+                'windows': windows,
+                'progress_values': progress_values_from_rows(metric_rows),
+            }
         )
         for goal_data in goal_serializer.data:
             if goal_data.get('progress', {}).get('percentage', 0) >= 50:
                 goals_on_track += 1
 
-        return Response({
-            'total_metrics_logged': total_metrics,
-            'active_goals': active_goals.count(),
-            'metrics_this_week': metrics_this_week,
+        return {
+            'total_metrics_logged': sum(row['total'] for row in metric_rows),
+            'active_goals': len(active_goals),
+            'metrics_this_week': sum(row['this_week'] for row in metric_rows),
             'goals_on_track': goals_on_track,
             'recent_metrics': HealthMetricSerializer(
                 recent_metrics, many=True, context={'request': request}
             ).data,
             'goal_progress': goal_serializer.data
-        })
+        }